@@ -15,7 +15,16 @@ img_resizer.py
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
+import contextlib
+import functools
+import io
+import mmap
+import os
+import threading
+import shutil
 import sys
+import warnings
 from pathlib import Path
 from typing import Iterable, List, Tuple, Optional
 
@@ -26,6 +35,29 @@ ALLOWED_EXTS = {
     ".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tif", ".tiff", ".webp"
 }
 
+# Pillowの列挙値はモジュール定数に束縛しておく。
+# 毎回の属性ルックアップ（GIFではフレームごと）を省く。
+_LANCZOS = Image.Resampling.LANCZOS
+_NEAREST = Image.Resampling.NEAREST
+_MEDIANCUT = Image.Quantize.MEDIANCUT
+_FS_DITHER = Image.Dither.FLOYDSTEINBERG
+_NO_DITHER = Image.Dither.NONE
+
+
+def warn_if_stock_pillow() -> None:
+    """
+    Pillow-SIMD（AVX2カーネル版）が入っていなければ一度だけ案内を出す。
+    SIMD版はバージョン文字列が「9.0.0.post1」のように .postN 付きになる。
+    リサイズのホットパスはLANCZOS畳み込みなので、差し替えるだけで2〜6倍速くなる。
+    """
+    import PIL
+
+    if ".post" not in getattr(PIL, "__version__", ""):
+        warnings.warn(
+            "標準のPillowが検出されました。pillow-simd に差し替えるとリサイズが"
+            "2〜6倍高速になります: pip uninstall pillow && pip install pillow-simd"
+        )
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
@@ -54,6 +86,32 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="フォルダ指定時、サブフォルダも含めて再帰的に処理する"
     )
+    parser.add_argument(
+        "--min-scale-delta",
+        type=float,
+        default=0.5,
+        help="リサイズ率が100%%からこの差未満の場合、リサンプルせず"
+             "元ファイルをそのままコピーする（デフォルト: 0.5）"
+    )
+    parser.add_argument(
+        "--deep-scan",
+        action="store_true",
+        help="拡張子が未知のファイルもマジックナンバーで画像判定する"
+             "（デフォルトは拡張子のみで判定）"
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="並列実行数（デフォルト: CPUコア数）。1 を指定すると逐次処理。"
+    )
+    parser.add_argument(
+        "--executor",
+        choices=("process", "thread"),
+        default="process",
+        help="並列化方式。process はフォークのオーバーヘッドがある分CPUを使い切り、"
+             "thread はPillowのC処理がGILを解放するため軽量（デフォルト: process）"
+    )
     args = parser.parse_args()
 
     # 入力バリデーション
@@ -61,11 +119,19 @@ def parse_args() -> argparse.Namespace:
         parser.error("リサイズ率（-p / --percent）は 0 より大きい値を指定してください。")
     if not args.prefix:
         parser.error("プレフィックス（-o / --prefix）は空文字にできません。")
+    if args.jobs < 1:
+        parser.error("並列数（-j / --jobs）は 1 以上を指定してください。")
+    if args.min_scale_delta < 0:
+        parser.error("--min-scale-delta は 0 以上を指定してください。")
 
     return args
 
 
-def collect_target_files(paths: Iterable[str], recursive: bool = False) -> List[Path]:
+def collect_target_files(
+    paths: Iterable[str],
+    recursive: bool = False,
+    deep_scan: bool = False
+) -> List[Path]:
     """
     ファイル/フォルダ指定から、処理対象の画像ファイル一覧を収集する。
     """
@@ -74,17 +140,26 @@ def collect_target_files(paths: Iterable[str], recursive: bool = False) -> List[
     for p in paths:
         path = Path(p).resolve()
         if path.is_file():
-            if is_supported_image(path):
+            if is_supported_image(path, deep_scan=deep_scan):
                 targets.append(path)
             else:
                 print(f"[SKIP] 非対応または画像ではない可能性: {path.name}", file=sys.stderr)
         elif path.is_dir():
-            # 再帰フラグによって探索方法を分岐
-            iterator = path.rglob("*") if recursive else path.iterdir()
-            
-            for child in iterator:
-                if child.is_file() and is_supported_image(child):
-                    targets.append(child)
+            # os.scandir / os.walk は getdents が返す d_type を使うため、
+            # Path.iterdir + is_file() のようなエントリごとの stat() が出ない。
+            # Path の生成も対応ファイルに絞ってから行う。
+            if recursive:
+                for root, _dirs, files in os.walk(path):
+                    for name in files:
+                        if _is_supported_name(name, os.path.join(root, name), deep_scan):
+                            targets.append(Path(root, name))
+            else:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        if entry.is_file() and _is_supported_name(
+                            entry.name, entry.path, deep_scan
+                        ):
+                            targets.append(Path(entry.path))
         else:
             print(f"[WARN] 見つからないパス: {path}", file=sys.stderr)
 
@@ -94,44 +169,118 @@ def collect_target_files(paths: Iterable[str], recursive: bool = False) -> List[
     return targets
 
 
-def is_supported_image(path: Path) -> bool:
+def _has_image_magic(path: "str | Path") -> bool:
     """
-    対応拡張子判定。隠しファイル（.から始まるもの）は除外。
+    先頭12バイトのマジックナンバーで対応画像かどうかを判定する。
+    ヘッダ全体のパースは不要なので、未知ファイルの篩い分けはほぼタダで済む。
     """
-    if path.name.startswith("."):
+    try:
+        with open(path, "rb") as f:
+            head = f.read(12)
+    except OSError:
         return False
-        
-    if path.suffix.lower() in ALLOWED_EXTS:
+
+    if head.startswith(b"\xff\xd8\xff"):            # JPEG
         return True
-    
-    # 拡張子が未知の場合、試しに開いてみる
-    try:
-        with Image.open(path) as im:
-            im.verify()
+    if head.startswith(b"\x89PNG"):                 # PNG
+        return True
+    if head.startswith(b"GIF8"):                    # GIF87a / GIF89a
         return True
-    except Exception:
+    if head.startswith(b"BM"):                      # BMP
+        return True
+    if head.startswith((b"II*\x00", b"MM\x00*")):   # TIFF (リトル/ビッグエンディアン)
+        return True
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return True
+    return False
+
+
+def _is_supported_name(name: str, fspath: "str | Path", deep_scan: bool) -> bool:
+    """
+    ファイル名ベースの対応画像判定（フォルダ走査用の軽量版）。
+    Path を生成せずに済むよう、名前とパス文字列を受け取る。
+    """
+    if name.startswith("."):
         return False
 
+    suf = os.path.splitext(name)[1].lower()
+    if suf in ALLOWED_EXTS:
+        return True
+
+    if deep_scan:
+        return _has_image_magic(fspath)
+
+    return False
+
+
+def is_supported_image(path: Path, deep_scan: bool = False) -> bool:
+    """
+    対応画像判定。隠しファイル（.から始まるもの）は除外。
+    基本は拡張子のホワイトリストのみで判定し、deep_scan 指定時だけ
+    拡張子が未知のファイルをマジックナンバーで追加判定する。
+    """
+    return _is_supported_name(path.name, path, deep_scan)
+
 
-def compute_new_size(orig_size: Tuple[int, int], percent: float) -> Tuple[int, int]:
+def compute_new_size(orig_size: Tuple[int, int], scale: float) -> Tuple[int, int]:
+    # int(x + 0.5) は round() より速い（round はC側のbanker's roundingと
+    # 呼び出しオーバーヘッドを通る）。scale はバッチ全体で固定なので
+    # percent からの除算は main で一度だけ行う。
     w, h = orig_size
-    scale = percent / 100.0
-    new_w = max(1, round(w * scale))
-    new_h = max(1, round(h * scale))
-    return new_w, new_h
+    return max(1, int(w * scale + 0.5)), max(1, int(h * scale + 0.5))
 
 
 def unique_output_path(src: Path, prefix: str) -> Path:
     """
-    出力先のユニークなパスを生成。
+    出力先のユニークなパスを生成し、O_CREAT|O_EXCL で原子的に予約する。
+    exists() を連番でプローブする方式は resized_* が溜まったフォルダで
+    1ファイルあたり O(N) 回の stat になるうえ、並列実行では複数ワーカーが
+    同じ空き名を同時に掴むレースがあるため、ファイル作成自体を衝突判定に使う。
     """
     base_name = f"{prefix}{src.stem}"
     out = src.with_name(f"{base_name}{src.suffix}")
-    idx = 1
-    while out.exists():
-        out = src.with_name(f"{base_name}_{idx}{src.suffix}")
-        idx += 1
-    return out
+    while True:
+        try:
+            fd = os.open(out, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            # 衝突時はランダムなサフィックスで再試行（連番プローブを避ける）
+            out = src.with_name(f"{base_name}_{os.urandom(3).hex()}{src.suffix}")
+            continue
+        os.close(fd)
+        return out
+
+
+def _resize_direct(im: Image.Image, new_size: Tuple[int, int]) -> Image.Image:
+    return im.resize(new_size, resample=_LANCZOS)
+
+
+def _resize_p(im: Image.Image, new_size: Tuple[int, int]) -> Image.Image:
+    # リサンプルのコストはバンド数に比例するので、アルファが不要なら
+    # RGBAではなくRGBに留めて無駄なチャンネルを増やさない
+    im = im.convert("RGBA" if "transparency" in im.info else "RGB")
+    return im.resize(new_size, resample=_LANCZOS)
+
+
+def _resize_1(im: Image.Image, new_size: Tuple[int, int]) -> Image.Image:
+    return im.convert("L").resize(new_size, resample=_LANCZOS)
+
+
+def _resize_la(im: Image.Image, new_size: Tuple[int, int]) -> Image.Image:
+    return im.convert("RGBA").resize(new_size, resample=_LANCZOS)
+
+
+# ソースモード -> リサイズ関数のディスパッチテーブル。
+# パレットモード(P)や1bit(1)はリサイズ品質向上のため多階調モードに変換してから、
+# それ以外は変換なしの直行パスでリサンプルする。
+_RESIZE_BY_MODE = {
+    "RGB": _resize_direct,
+    "RGBA": _resize_direct,
+    "L": _resize_direct,
+    "YCbCr": _resize_direct,
+    "P": _resize_p,
+    "1": _resize_1,
+    "LA": _resize_la,
+}
 
 
 def resize_static_image(
@@ -142,156 +291,347 @@ def resize_static_image(
     静止画像のリサイズ。
     ※ 呼び出し側で既に exif_transpose 済みであることを前提とする。
     """
-    # パレットモード(P)や1bit(1)の場合、リサイズ品質向上のためRGBA/RGBに変換
-    if im.mode in ("P", "1", "LA"):
-        im = im.convert("RGBA")
+    return _RESIZE_BY_MODE.get(im.mode, _resize_direct)(im, new_size)
+
+
+# エンコード先バッファ。ワーカーごと（スレッド/プロセス）に1つ確保して
+# バッチ全体で使い回し、保存のたびのバッファ再確保を避ける。
+_SAVE_BUF = threading.local()
+
+
+def _write_atomic(im: Image.Image, dst: Path, fmt: str, save_kwargs: dict) -> None:
+    """
+    再利用バッファにエンコードしてから一時ファイル経由で os.replace する。
+    途中でプロセスが落ちても中途半端な出力ファイルが残らない。
+    """
+    buf = getattr(_SAVE_BUF, "buf", None)
+    if buf is None:
+        buf = _SAVE_BUF.buf = io.BytesIO()
+    buf.seek(0)
+    buf.truncate()
+
+    im.save(buf, format=fmt, **save_kwargs)
+
+    tmp = dst.with_suffix(dst.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(buf.getbuffer())
+    os.replace(tmp, dst)
+
+
+# 形式ごとの保存パラメータ。呼び出しのたびに組み立て直さず、ここで一度だけ定義する。
+_JPEG_KW = {"quality": 95, "subsampling": 0, "progressive": True, "optimize": True}
+_PNG_KW = {"optimize": True, "compress_level": 9}
+_WEBP_KW = {"quality": 90, "method": 6}
+_TIFF_KW = {"compression": "tiff_lzw"}
 
-    # 高品質リサンプル
-    return im.resize(new_size, resample=Image.Resampling.LANCZOS)
+
+_SENTINEL = object()
+
+
+class _LazySrcInfo:
+    """
+    保存時に使うソース画像のメタデータ。EXIF/ICCの取り出しは実際に
+    参照されるまで遅延するので、保存側が触らない形式（BMP/GIFなど）では
+    info辞書への問い合わせ自体が発生しない。
+    """
+    __slots__ = ("_info", "format", "_exif", "_icc")
+
+    def __init__(self, im: Image.Image, fmt: str):
+        self._info = im.info
+        self.format = fmt
+        self._exif = _SENTINEL
+        self._icc = _SENTINEL
+
+    @property
+    def exif(self):
+        if self._exif is _SENTINEL:
+            self._exif = self._info.get("exif")
+        return self._exif
+
+    @property
+    def icc_profile(self):
+        if self._icc is _SENTINEL:
+            self._icc = self._info.get("icc_profile")
+        return self._icc
+
+
+def _save_jpeg(im: Image.Image, dst: Path, fmt: str, info: _LazySrcInfo) -> None:
+    # アルファチャンネル(RGBA)があると保存できないため白背景に合成してRGBに変換。
+    # alpha_composite はC実装の1パスで済む（split()+paste() だと
+    # バンドごとの一時画像4枚とマスク付きコピーが発生する）。
+    if im.mode in ("RGBA", "LA"):
+        if im.mode == "LA":
+            im = im.convert("RGBA")
+        background = Image.new("RGBA", im.size, (255, 255, 255, 255))
+        im = Image.alpha_composite(background, im).convert("RGB")
+    elif im.mode not in ("RGB", "YCbCr"):
+        # YCbCrはJPEGエンコーダが直接受け付ける（RGB往復が不要）
+        im = im.convert("RGB")
+
+    save_kwargs = dict(_JPEG_KW)
+    if info.icc_profile:
+        save_kwargs["icc_profile"] = info.icc_profile
+    if info.exif:
+        save_kwargs["exif"] = info.exif
+    _write_atomic(im, dst, "JPEG", save_kwargs)
+
+
+def _save_png(im: Image.Image, dst: Path, fmt: str, info: _LazySrcInfo) -> None:
+    save_kwargs = dict(_PNG_KW)
+    if info.icc_profile:
+        save_kwargs["icc_profile"] = info.icc_profile
+    if info.exif:
+        save_kwargs["exif"] = info.exif
+    _write_atomic(im, dst, "PNG", save_kwargs)
+
+
+def _save_webp(im: Image.Image, dst: Path, fmt: str, info: _LazySrcInfo) -> None:
+    save_kwargs = dict(_WEBP_KW)
+    if info.icc_profile:
+        save_kwargs["icc_profile"] = info.icc_profile
+    if info.exif:
+        save_kwargs["exif"] = info.exif
+    _write_atomic(im, dst, "WEBP", save_kwargs)
+
+
+def _save_tiff(im: Image.Image, dst: Path, fmt: str, info: _LazySrcInfo) -> None:
+    save_kwargs = dict(_TIFF_KW)
+    if info.icc_profile:
+        save_kwargs["icc_profile"] = info.icc_profile
+    if info.exif:
+        save_kwargs["exif"] = info.exif
+    _write_atomic(im, dst, fmt, save_kwargs)
+
+
+def _save_default(im: Image.Image, dst: Path, fmt: str, info: _LazySrcInfo) -> None:
+    save_kwargs = {}
+    if info.icc_profile:
+        save_kwargs["icc_profile"] = info.icc_profile
+    _write_atomic(im, dst, fmt, save_kwargs)
+
+
+# フォーマット名 -> 保存関数のディスパッチテーブル。
+# if/elif の文字列比較チェーンをハッシュ引きに置き換える。
+FORMAT_HANDLERS = {
+    "JPEG": _save_jpeg,
+    "PNG": _save_png,
+    "WEBP": _save_webp,
+    "TIFF": _save_tiff,
+    "TIF": _save_tiff,
+}
 
 
 def save_image_with_metadata(
     im_resized: Image.Image,
     src: Path,
     dst: Path,
-    src_info: dict
+    src_info: _LazySrcInfo
 ) -> None:
     """
     形式ごとのメタデータ配慮をしつつ保存。
     """
     # フォーマット判定
-    fmt = (src_info.get("format") or src.suffix.replace(".", "")).upper()
+    fmt = (src_info.format or src.suffix.replace(".", "")).upper()
     if fmt == "JPG":
         fmt = "JPEG"
 
-    exif = src_info.get("exif")
-    icc = src_info.get("icc_profile")
+    handler = FORMAT_HANDLERS.get(fmt, _save_default)
+    handler(im_resized, dst, fmt, src_info)
 
-    save_kwargs = {}
+
+def _derive_master_palette(
+    im: Image.Image,
+    sample_size: Tuple[int, int] = (64, 64),
+    max_samples: int = 8,
+) -> Image.Image:
+    """
+    アニメ全体を代表する適応パレットを導出する。
+    先頭フレームだけから作ると、色が時間変化するアニメ（フェード等）で
+    後半フレームが先頭の色に誤って再マップされる。等間隔にサンプリングした
+    フレームの縮小サムネイルを1枚のストリップに並べ、それを median-cut にかける。
+    サムネイルはNEAREST（元の色をそのまま保持し、パレット導出には十分）。
+    """
+    n = getattr(im, "n_frames", 1)
+    count = min(max_samples, n)
+
+    strip = Image.new("RGB", (sample_size[0] * count, sample_size[1]))
+    for i in range(count):
+        im.seek(i * (n - 1) // (count - 1) if count > 1 else 0)
+        thumb = im.convert("RGB").resize(sample_size, resample=_NEAREST)
+        strip.paste(thumb, (i * sample_size[0], 0))
+
+    im.seek(0)
+    return strip.quantize(colors=256, method=_MEDIANCUT)
+
+
+def _frame_stream(
+    im: Image.Image,
+    new_size: Tuple[int, int],
+    durations: List[int],
+    disposals: List[int],
+    default_disposal: int,
+    master_palette: Image.Image,
+) -> Iterable[Image.Image]:
+    """
+    各フレームを遅延変換して返すジェネレータ。
+    durations / disposals はフレームを yield する直前に追記される。
+
+    適応パレットは _derive_master_palette で一度だけ導出したものを
+    全フレームで共有する。フレームごとに median-cut をやり直すと N 倍の
+    無駄になるうえ、パレットがフレーム間で揺れてGIFのLZW圧縮も効きにくくなる。
+    """
+    for frame in ImageSequence.Iterator(im):
+        durations.append(frame.info.get("duration", 100))
+        disposals.append(frame.info.get("disposal", default_disposal))
+
+        # 元からパレット画像のフレーム（GIFはほぼ常にP）は色数が高々256なので、
+        # FSディザの誤差拡散（シリアルで重い）を掛け直しても画質はほぼ変わらない。
+        # 最近傍のパレット引きで済む NONE に落とす。
+        dither = _NO_DITHER if frame.mode == "P" else _FS_DITHER
+
+        fr = frame.convert("RGB").resize(new_size, resample=_LANCZOS)
+
+        # P→RGB変換はパレットの transparency をRGBタプルとして info に引き継ぎ、
+        # resize / quantize を経てP化したフレームにまで残る。GIFエンコーダは
+        # int/bytes 以外の transparency を受け付けず保存が失敗するため、ここで捨てる
+        # （出力GIFには元々透過を書き出していない）。
+        fr.info.pop("transparency", None)
+
+        yield fr.quantize(palette=master_palette, dither=dither)
+
+
+def resize_animated_gif(im: Image.Image, src: Path, scale: float, prefix: str) -> Path:
+    """
+    開いた状態のアニメGIFをフレームごとにリサイズして保存。
+    変換済みフレームを全部ためこむとメモリがフレーム数に比例して膨らむため、
+    ジェネレータで1フレームずつエンコーダに渡す。
+    """
+    loop = im.info.get("loop", 0)
+    default_disposal = im.info.get("disposal", 2)
+    icc = im.info.get("icc_profile")
+
+    new_size = compute_new_size(im.size, scale)
+
+    master_palette = _derive_master_palette(im)
+
+    durations: List[int] = []
+    disposals: List[int] = []
+    frames = _frame_stream(
+        im, new_size, durations, disposals, default_disposal, master_palette
+    )
+
+    try:
+        first = next(frames)
+    except StopIteration:
+        raise ValueError("有効なフレームが見つかりませんでした。")
+
+    dst = unique_output_path(src, prefix)
+
+    # PillowのGIFエンコーダは append_images を遅延評価で消費するので、
+    # ジェネレータをそのまま渡せる。duration / disposal のリストは
+    # フレームが取り出されるたびに _frame_stream 側で埋まっていく。
+    save_kwargs = {
+        "save_all": True,
+        "append_images": frames,
+        "loop": loop,
+        "duration": durations,
+        "disposal": disposals,
+        "optimize": True,
+    }
     if icc:
         save_kwargs["icc_profile"] = icc
 
-    # JPEGの場合、アルファチャンネル(RGBA)があると保存できないためRGBに変換
-    if fmt == "JPEG":
-        if im_resized.mode in ("RGBA", "LA"):
-            background = Image.new("RGB", im_resized.size, (255, 255, 255))
-            background.paste(im_resized, mask=im_resized.split()[-1])
-            im_resized = background
-        elif im_resized.mode != "RGB":
-            im_resized = im_resized.convert("RGB")
-            
-        save_kwargs.update({
-            "quality": 95,
-            "subsampling": 0,
-            "progressive": True,
-            "optimize": True
-        })
-        if exif:
-            save_kwargs["exif"] = exif
-
-    elif fmt == "PNG":
-        save_kwargs.update({
-            "optimize": True,
-            "compress_level": 9
-        })
-        if exif:
-            try:
-                save_kwargs["exif"] = exif
-            except Exception:
-                pass
-
-    elif fmt == "WEBP":
-        save_kwargs.update({
-            "quality": 90,
-            "method": 6
-        })
-        if exif:
-            save_kwargs["exif"] = exif
-
-    elif fmt in {"TIFF", "TIF"}:
-        if exif:
-            save_kwargs["exif"] = exif
-        save_kwargs["compression"] = "tiff_lzw"
-
-    # 保存実行
-    im_resized.save(dst, format=fmt, **save_kwargs)
-
-
-def resize_animated_gif(src: Path, percent: float, prefix: str) -> Path:
+    try:
+        first.save(dst, **save_kwargs)
+    except TypeError:
+        # 全フレームが同一に潰れた（共有パレットで差分が消えた）場合、
+        # Pillowは単一フレーム書き込みにフォールバックするが、その経路は
+        # リスト値の duration / disposal を扱えない。スカラー値で保存し直す。
+        save_kwargs["append_images"] = []
+        save_kwargs["duration"] = sum(durations)
+        save_kwargs["disposal"] = disposals[0]
+        first.save(dst, **save_kwargs)
+    return dst
+
+
+class _LenientMmap(mmap.mmap):
     """
-    アニメGIFをフレームごとにリサイズして保存。
+    Pillowに渡すためのmmapラッパ。
+    通常ファイルはEOFを越えるseekを許すが、mmapはValueErrorを投げるため、
+    Image.openのフォーマット判定（例: PCDは先頭2048バイトへseekする）が
+    小さいファイルで誤爆する。seek位置をファイルサイズでクランプして回避する。
     """
-    with Image.open(src) as im:
-        loop = im.info.get("loop", 0)
-        default_disposal = im.info.get("disposal", 2)
-        icc = im.info.get("icc_profile")
-
-        new_size = compute_new_size(im.size, percent)
-        
-        frames = []
-        durations = []
-        disposals = []
-
-        for frame in ImageSequence.Iterator(im):
-            durations.append(frame.info.get("duration", 100))
-            disposals.append(frame.info.get("disposal", default_disposal))
-
-            fr = frame.convert("RGBA").resize(new_size, resample=Image.Resampling.LANCZOS)
-            fr = fr.convert("P", palette=Image.Palette.ADAPTIVE, dither=Image.Dither.FLOYDSTEINBERG)
-            frames.append(fr)
-
-        if not frames:
-            raise ValueError("有効なフレームが見つかりませんでした。")
-
-        dst = unique_output_path(src, prefix)
-        
-        save_kwargs = {
-            "save_all": True,
-            "append_images": frames[1:],
-            "loop": loop,
-            "duration": durations,
-            "disposal": disposals,
-            "optimize": True,
-        }
-        if icc:
-            save_kwargs["icc_profile"] = icc
-
-        frames[0].save(dst, **save_kwargs)
-        return dst
-
-
-def process_one_image(src: Path, percent: float, prefix: str) -> Optional[Path]:
+
+    def seek(self, pos: int, whence: int = 0):
+        size = len(self)
+        if whence == 1:
+            pos += self.tell()
+        elif whence == 2:
+            pos += size
+        return super().seek(min(max(pos, 0), size))
+
+
+def process_one_image(
+    src: Path,
+    scale: float,
+    prefix: str,
+    min_scale_delta: float = 0.5
+) -> Optional[Path]:
     """
     1ファイルのリサイズ実行（EXIF回転バグ修正版）。
+    scale はバッチ全体で固定の倍率（percent / 100）。
     """
     try:
-        is_animated = False
-        src_info = {}
-        
-        # 1. 予備情報を取得
-        with Image.open(src) as im:
+        # 100%（またはその近傍）指定ならリサンプル不要。バイト単位のコピーなら
+        # デコードもエンコードも走らず、EXIF/ICC/XMPも1バイト残らず保持される。
+        if abs(scale - 1.0) * 100.0 < max(min_scale_delta, 1e-9):
+            dst = unique_output_path(src, prefix)
+            shutil.copyfile(src, dst)
+            return dst
+
+        # 1回のオープンでメタデータ取得から変換まで行う
+        # （probe用とリサイズ用で2回開くとヘッダ解析とI/Oが倍になる）。
+        # ソースはmmapで渡す。ページキャッシュから直接デコードでき、
+        # read() の繰り返し（特にGIF/TIFFのシーク往復）が1回のmmapで済む。
+        with open(src, "rb") as f, \
+             _LenientMmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+             Image.open(mm) as im:
             fmt = (im.format or src.suffix.replace(".", "")).upper()
+            src_info = _LazySrcInfo(im, fmt)
+
+            # アニメーションGIFの場合
             if fmt == "GIF" and getattr(im, "n_frames", 1) > 1:
-                is_animated = True
-            
-            src_info = {
-                "format": fmt,
-                "exif": im.info.get("exif"),
-                "icc_profile": im.info.get("icc_profile"),
-            }
-
-        # 2. アニメーションGIFの場合
-        if is_animated:
-            return resize_animated_gif(src, percent, prefix)
-        
-        # 3. 静止画の場合
-        with Image.open(src) as im:
+                return resize_animated_gif(im, src, scale, prefix)
+
+            # 静止画の場合
+            # 最終サイズは元画像のフルサイズから先に確定しておく
+            new_size = compute_new_size(im.size, scale)
+
+            # JPEGはdraftでデコード段階から縮小できる（libjpegが1/2, 1/4, 1/8
+            # スケールでIDCTをスキップするため、縮小率が高いほどデコードが速い）。
+            # さらにJPEG→JPEGならYCbCrのままパイプラインを通すことで、
+            # デコード時のYCbCr→RGB変換とエンコード時のRGB→YCbCr変換を
+            # 両方スキップできる。ピクセルデータをロードする前に呼ぶ必要がある。
+            if fmt == "JPEG":
+                im.draft("YCbCr" if im.mode == "RGB" else im.mode, new_size)
+                try:
+                    im.load()
+                except OSError:
+                    # RGBのまま符号化されたJPEG（Adobe APP14 transform 0 など）は
+                    # libjpegがYCbCrへ色変換できず読み込みに失敗する。
+                    # 開き直してスケール指定のみのdraftでやり直す。
+                    mm.seek(0)
+                    im = Image.open(mm)
+                    im.draft(None, new_size)
+
             # --- 修正ポイント：リサイズ計算の前に回転を適用する ---
+            pre_transpose_size = im.size
             im = ImageOps.exif_transpose(im)
-            
-            # 正しい向きになった後の im.size を使って計算
-            new_size = compute_new_size(im.size, percent)
-            
+
+            # 90/270度回転で縦横が入れ替わった場合はターゲットも入れ替える
+            if im.size != pre_transpose_size:
+                new_size = (new_size[1], new_size[0])
+
             # リサイズ実行
             im_resized = resize_static_image(im, new_size)
             
@@ -307,9 +647,14 @@ def process_one_image(src: Path, percent: float, prefix: str) -> Optional[Path]:
 
 def main() -> None:
     args = parse_args()
-    
+
+    # ワーカープロセス側で繰り返し出ないよう、メインプロセスでのみ警告する
+    warn_if_stock_pillow()
+
     # ターゲット収集
-    targets = collect_target_files(args.paths, recursive=args.recursive)
+    targets = collect_target_files(
+        args.paths, recursive=args.recursive, deep_scan=args.deep_scan
+    )
 
     if not targets:
         sys.exit(1)
@@ -317,21 +662,47 @@ def main() -> None:
     percent = args.percent
     prefix = args.prefix
 
+    # 倍率はバッチ全体で固定なので、除算はここで一度だけ行う
+    scale = percent / 100.0
+
     print(f"--- 開始 ---")
     print(f"対象数: {len(targets)} ファイル")
     print(f"設定: {percent}% リサイズ / プレフィックス: '{prefix}'")
     if args.recursive:
         print("モード: 再帰処理 ON")
+    if args.jobs > 1:
+        print(f"並列数: {args.jobs} ({args.executor})")
     print("-----------------------------------")
 
+    worker = functools.partial(
+        process_one_image,
+        scale=scale,
+        prefix=prefix,
+        min_scale_delta=args.min_scale_delta,
+    )
+
+    # リサイズはファイルごとに独立しているため、単純にワーカーへ分配できる。
+    # ex.map は入力順に結果を返すので進捗表示の順序も保たれる。
+    # chunksize はタスクが重い（デコード+リサイズ+エンコード）分のIPC回数を抑えるため。
     success_count = 0
-    for i, src in enumerate(targets, 1):
-        dst = process_one_image(src, percent, prefix)
-        if dst:
-            success_count += 1
-            print(f"[{i}/{len(targets)}] OK: {src.name} -> {dst.name}")
+    with contextlib.ExitStack() as stack:
+        if args.jobs == 1:
+            results = map(worker, targets)
         else:
-            print(f"[{i}/{len(targets)}] NG: {src.name}")
+            executor_cls = (
+                concurrent.futures.ProcessPoolExecutor
+                if args.executor == "process"
+                else concurrent.futures.ThreadPoolExecutor
+            )
+            ex = stack.enter_context(executor_cls(max_workers=args.jobs))
+            results = ex.map(worker, targets, chunksize=4)
+
+        for i, (src, dst) in enumerate(zip(targets, results), 1):
+            if dst:
+                success_count += 1
+                print(f"[{i}/{len(targets)}] OK: {src.name} -> {dst.name}")
+            else:
+                print(f"[{i}/{len(targets)}] NG: {src.name}")
 
     print("-----------------------------------")
     print(f"[完了] 成功: {success_count} / 失敗: {len(targets) - success_count}")